@@ -7,16 +7,27 @@
    Simulates a swarm of autonomous "ant" robots exploring the Moon's surface
    to locate and retrieve an ice deposit. Each ant:
      - Moves with randomized direction adjustments.
-     - Leaves behind microdot markers as it explores.
+     - Records every position it visits; that path is its microdot trail.
      - Picks up ice when within detection range.
      - Returns along its original path to deliver ice back to the lander.
      - Marks its return path as a goal trail others can follow.
+
+ Usage:
+   python antBiomodeling.py [--variant objects|vectorized|jax] [--trials N] [--seed S]
+                            [--parallel] [--numba]
 ===============================================================================
 """
 
+import argparse
+import importlib.util
 import math
 import random
+from functools import lru_cache, partial
+from itertools import starmap
+from multiprocessing import Pool
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 
 # -----------------------------------------------------------------------------
 # Simulation Constants
@@ -31,86 +42,110 @@ ICE_RADIUS = 1.0                     # Radius of the ice deposit
 ICE_DETECTION_RANGE = 4             # Detection buffer range around the ice
 DEGREES = [-3, 0, 3]                 # Angular deviations from current heading (degrees)
 LOG_FILENAME = "ant_movements.log"  # File to record ant behavior
+LOG_MOVES = True                     # Record every step in the log (False skips all logging)
+NUM_TRIALS = 1                       # Independent runs; above 1 runs a batch and plots statistics
+SEED = 2025                          # Base seed; each ant's RNG is derived from (seed, ant id)
+VARIANT = "objects"                  # Default simulation variant (one of VARIANTS)
+VARIANTS = ("objects", "vectorized", "jax")   # Ant classes, NumPy/Numba arrays, or JAX arrays
+
+# Most moves an ant can make: it stops at MAX_DISTANCE or after MAX_STEPS
+MAX_MOVES = min(MAX_STEPS, math.ceil(MAX_DISTANCE / ANT_SPEED))
+
+ICE_R2 = (ICE_RADIUS + ICE_DETECTION_RANGE) ** 2   # Squared ice detection distance
+LOST_R2 = 100 ** 2                                 # Squared distance from ice at which an ant is lost
+
+# Unit heading vectors for every whole-degree heading (headings are always integers)
+COS = [math.cos(math.radians(d)) for d in range(360)]
+SIN = [math.sin(math.radians(d)) for d in range(360)]
+COS_TABLE = np.array(COS, dtype=np.float32)
+SIN_TABLE = np.array(SIN, dtype=np.float32)
+
+# float32 copies of the constants used by the swarm ticks, so arithmetic on the
+# float32 state arrays is never promoted to float64
+SPEED_F32 = np.float32(ANT_SPEED)
+ICE_X_F32 = np.float32(ICE_LOCATION[0])
+ICE_Y_F32 = np.float32(ICE_LOCATION[1])
+ICE_R2_F32 = np.float32(ICE_R2)
+LOST_R2_F32 = np.float32(LOST_R2)
+
+# Swarm modes used by the vectorized simulation (mirror Ant.mode)
+MODE_SEARCH, MODE_RETURN, MODE_IDLE, MODE_LOST = range(4)
 
 # -----------------------------------------------------------------------------
 # Classes
 # -----------------------------------------------------------------------------
 
-class Microdot:
-    """
-    Represents a microdot marker dropped by an ant during exploration.
-    These serve as breadcrumbs and are upgraded to goal trail markers after
-    an ant discovers ice and returns.
-    """
-    def __init__(self, pos, is_goal=False):
-        self.pos = pos                  # (x, y) coordinates
-        self.is_goal = is_goal          # True if part of a goal trail
-        self.to_ice = None              # Vector or hint to ice location
-        self.to_lander = None           # Vector or hint back to lander
-
-
 class Ant:
     """
     Models an autonomous ant exploring for ice and returning it to base.
     Ants use a randomized movement pattern and retrace their own paths after
     discovering ice. The first discoverer creates a goal trail others could use.
     """
-    def __init__(self, id, lander_pos=(0, 0)):
+    def __init__(self, id, lander_pos=(0, 0), seed=None):
         self.id = id
+        self.rng = random.Random(seed)       # Per-ant RNG for reproducible runs
         self.lander_pos = lander_pos
         self.pos = lander_pos
-        self.path = [lander_pos]             # Path taken during exploration
-        self.retrieval_path = []             # Reverse of path to ice
-        self.microdots = []                  # Markers dropped along path
-        self.goal_path = []                  # Return path, marked as goal trail
-        self.direction = random.randint(0, 359)
+        # Microdot trail: every position visited, outbound and back (room for both)
+        self.path = np.empty((2 * MAX_MOVES + 2, 2), dtype=np.float32)
+        self.path[0] = lander_pos
+        self.step_count = 1                  # Number of filled rows in path
+        self.retrieval_idx = -1              # Index into path of next return waypoint (-1 if none)
+        self.goal_path = None                # Return path as an (N, 2) array, once ice is found
+        self.direction = self.rng.randint(0, 359)
+        self.turns = self.rng.choices(DEGREES, k=MAX_MOVES)   # Heading change for every move
+        self.turn_idx = 0
         self.distance_traveled = 0
         self.mode = "search"                 # 'search', 'return', 'idle', or 'lost'
         self.is_carrying_ice = False
         self.has_delivered_ice = False
         self.lost = False
 
-    def move(self, log_file):
+    def move(self, log):
         """
         Perform one unit of movement in the current direction.
-        Updates position, drops a microdot, checks for ice detection.
+        Updates position, records it in the path, checks for ice detection.
+        Log records are appended to the log list (if any) and written out later.
         """
         if self.mode in ["lost", "return", "idle"]:
             return
 
         # Abort if too far or out of range
         if self.distance_traveled >= MAX_DISTANCE:
-            if self.distance_from(ICE_LOCATION) > 100:
+            if self.squared_distance_from(ICE_LOCATION) > LOST_R2:
                 self.mode = "lost"
                 self.lost = True
             return
 
         # Slight angular deviation (left, right, or straight)
-        angle_change = random.choice(DEGREES)
+        angle_change = self.turns[self.turn_idx]
+        self.turn_idx += 1
         self.direction = (self.direction + angle_change) % 360
-        rad = math.radians(self.direction)
 
         # Compute new (x, y) position
-        dx = ANT_SPEED * math.cos(rad)
-        dy = ANT_SPEED * math.sin(rad)
+        dx = ANT_SPEED * COS[self.direction]
+        dy = ANT_SPEED * SIN[self.direction]
         new_pos = (self.pos[0] + dx, self.pos[1] + dy)
 
         # Update state
         self.pos = new_pos
-        self.path.append(new_pos)
-        self.microdots.append(Microdot(new_pos))
+        self.path[self.step_count] = new_pos
+        self.step_count += 1
         self.distance_traveled += ANT_SPEED
-        log_file.write(f"Ant {self.id} moved to {self.pos}\n")
+        if log is not None:
+            log.append((self.id, "moved to", self.pos))
 
-        # Check for ice detection
-        if self.detect_ice():
-            self.pickup_ice(log_file)
+        # Check for ice detection (squared distances skip the sqrt)
+        d2 = self.squared_distance_from(ICE_LOCATION)
+        if d2 <= ICE_R2:
+            self.pickup_ice(log)
 
         # Mark as lost if wandered too far from ice
-        if self.distance_from(ICE_LOCATION) > 100:
+        if d2 > LOST_R2:
             self.mode = "lost"
             self.lost = True
-            log_file.write(f"Ant {self.id} is lost\n")
+            if log is not None:
+                log.append((self.id, "is lost", None))
 
     def move_home(self):
         """
@@ -120,28 +155,26 @@ class Ant:
         if self.mode != "return":
             return
 
-        if not self.retrieval_path:
+        if self.retrieval_idx < 0:
             self.pos = self.lander_pos
             self.deliver_ice()
             return
 
-        self.pos = self.retrieval_path.pop(0)
-        self.path.append(self.pos)
+        self.pos = tuple(self.path[self.retrieval_idx].tolist())
+        self.retrieval_idx -= 1
+        self.path[self.step_count] = self.pos
+        self.step_count += 1
 
-    def detect_ice(self):
+    def pickup_ice(self, log):
         """
-        Returns True if ant is within detection range of the ice deposit.
+        Triggers when an ant reaches the ice. Sets return mode and points the
+        retrieval index at the end of the path so the ant walks it backwards.
         """
-        return self.distance_from(ICE_LOCATION) <= (ICE_RADIUS + ICE_DETECTION_RANGE)
-
-    def pickup_ice(self, log_file):
-        """
-        Triggers when an ant reaches the ice. Sets return mode and builds retrieval path.
-        """
-        log_file.write(f"Ant {self.id} picked up ice at {self.pos}\n")
+        if log is not None:
+            log.append((self.id, "picked up ice at", self.pos))
         self.is_carrying_ice = True
         self.mode = "return"
-        self.retrieval_path = list(reversed(self.path))
+        self.retrieval_idx = self.step_count - 1
         self.mark_goal_trail()
 
     def deliver_ice(self):
@@ -155,89 +188,458 @@ class Ant:
 
     def mark_goal_trail(self):
         """
-        Converts the retrieval path into a visible goal trail for visualization
-        or future extension into collaborative trail-following behavior.
+        Records the retrieval path (the path to the ice, reversed) as a goal
+        trail for visualization or future collaborative trail-following.
+        The trail runs from the ice to self.lander_pos, so it needs no per-point
+        direction hints. It is a reversed view of the path (ants pickled back
+        from a worker process carry it as a separate array).
         """
-        for pos in self.retrieval_path:
-            dot = Microdot(pos, is_goal=True)
-            dot.to_ice = ICE_LOCATION
-            dot.to_lander = self.lander_pos
-            self.goal_path.append(dot)
+        self.goal_path = self.path[self.step_count - 1::-1]
 
-    def distance_from(self, point):
+    def squared_distance_from(self, point):
         """
-        Utility method to compute Euclidean distance from current position.
+        Utility method to compute squared Euclidean distance from current position.
+        Compare against squared thresholds (ICE_R2, LOST_R2) to avoid a sqrt.
         """
-        return math.dist(self.pos, point)
+        dx = self.pos[0] - point[0]
+        dy = self.pos[1] - point[1]
+        return dx * dx + dy * dy
 
 
 # -----------------------------------------------------------------------------
 # Simulation Execution
 # -----------------------------------------------------------------------------
 
-# Initialize all ant agents
-ants = [Ant(i) for i in range(NUM_ANTS)]
+def search(ant_id, seed=SEED, write_log=LOG_MOVES):
+    """
+    Runs the search phase for a single ant. Ants search independently, so this
+    can be dispatched across worker processes; returns the ant and its log
+    records (None when not logging).
+    """
+    ant = Ant(ant_id, seed=f"{seed}:{ant_id}")
+    log = [] if write_log else None
+    steps = 0
+    while ant.mode == "search" and steps < MAX_MOVES:
+        ant.move(log)
+        steps += 1
+    return ant, log
+
 
-with open(LOG_FILENAME, "w") as log_file:
-    # Search Phase
-    for ant in ants:
-        steps = 0
-        while ant.mode == "search" and steps < MAX_STEPS:
-            ant.move(log_file)
-            steps += 1
+def format_log(records):
+    """
+    Turns buffered (ant id, event, position) records into log file lines.
+    """
+    for ant_id, event, pos in records:
+        if pos is None:
+            yield f"Ant {ant_id} {event}\n"
+        else:
+            yield f"Ant {ant_id} {event} {pos}\n"
 
-    log_file.write("=== Beginning return phase ===\n")
+
+def run_ants(seed=SEED, parallel=False, write_log=LOG_MOVES):
+    """
+    Runs the object-based simulation: a search phase followed by the return
+    phase. Writes the movement log if requested and returns the list of ants.
+    The search is serial by default; a default-sized swarm is a few
+    milliseconds of work, far less than starting a process pool. Set parallel
+    for swarms large enough to pay for the pool.
+    """
+    # Search Phase (one task per ant)
+    tasks = [(ant_id, seed, write_log) for ant_id in range(NUM_ANTS)]
+    if parallel:
+        with Pool() as pool:
+            results = pool.starmap(search, tasks)
+    else:
+        results = list(starmap(search, tasks))
+    ants = [ant for ant, _ in results]
+    return_log = [] if write_log else None
 
     # Return Phase
     returning = [ant for ant in ants if ant.mode == "return"]
     if returning:
-        max_return_steps = max(len(a.retrieval_path) for a in returning)
+        # One tick per waypoint, plus one to deliver at the lander
+        max_return_steps = max(a.retrieval_idx + 1 for a in returning) + 1
         for _ in range(max_return_steps):
             for ant in returning:
-                if ant.retrieval_path:
+                if ant.retrieval_idx >= 0:
                     ant.move_home()
-                    log_file.write(f"Ant {ant.id} returning via {ant.pos}\n")
+                    if return_log is not None:
+                        return_log.append((ant.id, "returning via", ant.pos))
                 elif ant.pos == ant.lander_pos and not ant.has_delivered_ice:
                     ant.deliver_ice()
-                    log_file.write(f"Ant {ant.id} delivered ice to lander\n")
+                    if return_log is not None:
+                        return_log.append((ant.id, "delivered ice to lander", None))
+
+    # Write the whole log in one pass once the simulation is done
+    if write_log:
+        with open(LOG_FILENAME, "w") as log_file:
+            for _, log in results:
+                log_file.writelines(format_log(log))
+            log_file.write("=== Beginning return phase ===\n")
+            if returning:
+                log_file.writelines(format_log(return_log))
+            else:
+                log_file.write("No ants discovered the ice.\n")
+
+    return ants
+
+
+def search_tick_numpy(xs, ys, dirs, dist, modes, step_count, paths, turns):
+    """
+    Advances every searching ant by one step using NumPy vector operations.
+    Returns the number of ants that moved.
+    """
+    active = np.flatnonzero((modes == MODE_SEARCH) & (dist < MAX_DISTANCE))
+    if active.size == 0:
+        return 0
+
+    dirs[active] = (dirs[active] + turns[active]) % 360
+    xs[active] += SPEED_F32 * COS_TABLE[dirs[active]]
+    ys[active] += SPEED_F32 * SIN_TABLE[dirs[active]]
+    dist[active] += SPEED_F32
+
+    paths[active, step_count[active], 0] = xs[active]
+    paths[active, step_count[active], 1] = ys[active]
+    step_count[active] += 1
+
+    dx = xs[active] - ICE_X_F32
+    dy = ys[active] - ICE_Y_F32
+    d2 = dx * dx + dy * dy
+    modes[active[d2 <= ICE_R2_F32]] = MODE_RETURN
+    modes[active[d2 > LOST_R2_F32]] = MODE_LOST
+    return active.size
+
+
+def search_tick_loop(xs, ys, dirs, dist, modes, step_count, paths, turns):
+    """
+    Same tick as search_tick_numpy written as a scalar loop over ants, which
+    Numba compiles to native code. Returns the number of ants that moved.
+    """
+    moved = 0
+    for i in range(xs.shape[0]):
+        if modes[i] != MODE_SEARCH or dist[i] >= MAX_DISTANCE:
+            continue
+
+        dirs[i] = (dirs[i] + turns[i]) % 360
+        xs[i] += SPEED_F32 * COS_TABLE[dirs[i]]
+        ys[i] += SPEED_F32 * SIN_TABLE[dirs[i]]
+        dist[i] += SPEED_F32
+
+        paths[i, step_count[i], 0] = xs[i]
+        paths[i, step_count[i], 1] = ys[i]
+        step_count[i] += 1
+
+        dx = xs[i] - ICE_X_F32
+        dy = ys[i] - ICE_Y_F32
+        d2 = dx * dx + dy * dy
+        if d2 <= ICE_R2_F32:
+            modes[i] = MODE_RETURN
+        elif d2 > LOST_R2_F32:
+            modes[i] = MODE_LOST
+        moved += 1
+    return moved
+
+
+def deliver_swarm_ice(modes):
+    """
+    Return Phase shared by the array simulations: carriers retrace their
+    recorded path, so every ant in MODE_RETURN delivers and goes idle.
+    Updates modes in place.
+    """
+    modes[modes == MODE_RETURN] = MODE_IDLE
+
+
+@lru_cache(maxsize=None)
+def load_search_tick_numba():
+    """
+    Imports Numba and compiles search_tick_loop on first use (cached on disk
+    after the first run). Loading the kernel costs far more than a default
+    swarm's search, so this is only used when asked for.
+    """
+    from numba import njit
+    return njit(cache=True, fastmath=True)(search_tick_loop)
+
+
+def simulate_swarm(seed=SEED, use_numba=False):
+    """
+    Structure-of-arrays version of the simulation. Each ant's state is one
+    slot in a set of NumPy arrays, so a tick updates the whole swarm at once
+    instead of making one method call per ant. Ticks use NumPy by default,
+    or the Numba-compiled loop when use_numba is set.
+    Returns the recorded search paths, their lengths, and each ant's mode.
+    """
+    search_tick = load_search_tick_numba() if use_numba else search_tick_numpy
+    rng = np.random.default_rng(seed)
+    xs = np.zeros(NUM_ANTS, dtype=np.float32)
+    ys = np.zeros(NUM_ANTS, dtype=np.float32)
+    dirs = rng.integers(0, 360, NUM_ANTS, dtype=np.int16)
+    dist = np.zeros(NUM_ANTS, dtype=np.float32)
+    modes = np.full(NUM_ANTS, MODE_SEARCH, dtype=np.int8)
+    # paths[:, 0] is the lander
+    paths = np.zeros((NUM_ANTS, MAX_MOVES + 1, 2), dtype=np.float32)
+    step_count = np.ones(NUM_ANTS, dtype=np.intp)
+
+    # Search Phase (all heading changes drawn up front in one call)
+    turns = rng.choice(np.array(DEGREES, dtype=np.int16), size=(MAX_MOVES, NUM_ANTS))
+    for step in range(MAX_MOVES):
+        if search_tick(xs, ys, dirs, dist, modes, step_count, paths, turns[step]) == 0:
+            break
+
+    deliver_swarm_ice(modes)
+    return paths, step_count, modes
+
+
+@lru_cache(maxsize=None)
+def load_swarm_jax():
+    """
+    Imports JAX and builds the jitted search phase on first use, so runs of
+    the other variants never pay for importing it.
+    Returns the jax module and the compiled run(state, keys) function.
+    """
+    import jax
+    import jax.numpy as jnp
+
+    cos_table = jnp.asarray(COS_TABLE)
+    sin_table = jnp.asarray(SIN_TABLE)
+    degrees = jnp.array(DEGREES)
+
+    def tick(state, key):
+        # One tick as a pure function of (xs, ys, dirs, dist, modes); ants
+        # that are not searching keep their state through jnp.where masks
+        xs, ys, dirs, dist, modes = state
+        active = (modes == MODE_SEARCH) & (dist < MAX_DISTANCE)
+
+        turns = jax.random.choice(key, degrees, (NUM_ANTS,))
+        dirs = jnp.where(active, (dirs + turns) % 360, dirs)
+        xs = jnp.where(active, xs + SPEED_F32 * cos_table[dirs], xs)
+        ys = jnp.where(active, ys + SPEED_F32 * sin_table[dirs], ys)
+        dist = jnp.where(active, dist + SPEED_F32, dist)
+
+        dx = xs - ICE_X_F32
+        dy = ys - ICE_Y_F32
+        d2 = dx * dx + dy * dy
+        modes = jnp.where(active & (d2 <= ICE_R2_F32), MODE_RETURN, modes)
+        modes = jnp.where(active & (d2 > LOST_R2_F32), MODE_LOST, modes)
+        return (xs, ys, dirs, dist, modes), (xs, ys)
+
+    def run(state, keys):
+        # lax.scan over one PRNG key per move compiles the whole search phase
+        # into a single XLA graph
+        return jax.lax.scan(tick, state, keys)
+
+    return jax, jax.jit(run)
+
+
+def simulate_swarm_jax(seed=SEED):
+    """
+    JAX version of simulate_swarm; runs on GPU/TPU when JAX finds one.
+    Scans over MAX_MOVES ticks, the most any ant can move.
+    Returns the same (paths, step_count, modes) NumPy arrays as simulate_swarm.
+    """
+    jax, run = load_swarm_jax()
+    jnp = jax.numpy
+    key, init_key = jax.random.split(jax.random.PRNGKey(seed))
+    state = (
+        jnp.zeros(NUM_ANTS, dtype=jnp.float32),
+        jnp.zeros(NUM_ANTS, dtype=jnp.float32),
+        jax.random.randint(init_key, (NUM_ANTS,), 0, 360, dtype=jnp.int32),
+        jnp.zeros(NUM_ANTS, dtype=jnp.float32),
+        jnp.full(NUM_ANTS, MODE_SEARCH, dtype=jnp.int8),
+    )
+    state, (xs, ys) = run(state, jax.random.split(key, MAX_MOVES))
+
+    # Ants only move while searching, so their moves are the first ticks and
+    # the distance travelled counts them
+    step_count = 1 + np.rint(np.asarray(state[3]) / ANT_SPEED).astype(np.intp)
+    paths = np.zeros((NUM_ANTS, MAX_MOVES + 1, 2), dtype=np.float32)
+    paths[:, 1:, 0] = np.asarray(xs).T
+    paths[:, 1:, 1] = np.asarray(ys).T
+
+    modes = np.array(state[4])
+    deliver_swarm_ice(modes)
+
+    return paths, step_count, modes
+
+
+def run_simulation(seed, variant=VARIANT, use_numba=False):
+    """
+    Runs one complete simulation of the given variant and seed, without
+    logging, and summarizes it. Used for batches of independent runs, so the
+    runs themselves stay in a single process.
+    Returns a dict with the seed, delivered and lost ant counts, and the mean
+    distance searched per ant.
+    """
+    if variant != "objects":
+        if variant == "jax":
+            _, step_count, modes = simulate_swarm_jax(seed)
+        else:
+            _, step_count, modes = simulate_swarm(seed, use_numba)
+        delivered = int(np.count_nonzero(modes == MODE_IDLE))
+        lost = int(np.count_nonzero(modes == MODE_LOST))
+        mean_distance = float((step_count - 1).mean() * ANT_SPEED)
     else:
-        log_file.write("No ants discovered the ice.\n")
+        ants = run_ants(seed, write_log=False)
+        delivered = sum(ant.has_delivered_ice for ant in ants)
+        lost = sum(ant.lost for ant in ants)
+        mean_distance = sum(ant.distance_traveled for ant in ants) / len(ants)
+
+    return {"seed": seed, "delivered": delivered, "lost": lost, "mean_distance": mean_distance}
 
 
 # -----------------------------------------------------------------------------
 # Visualization
 # -----------------------------------------------------------------------------
 
-plt.figure(figsize=(10, 8))
+def draw_paths(segments, delivered, lost, goal_segments):
+    """
+    Draws every ant path as one LineCollection and every goal trail as a
+    second one, rather than a Line2D per ant. Delivering ants get thick lines
+    and lost ants dashed ones; the legend shows one entry per status.
+    """
+    ax = plt.gca()
+    colors = plt.cm.tab20(np.arange(len(segments)) % 20)
+    linewidths = np.where(delivered, 2, 1)
+    linestyles = ['--' if is_lost else '-' for is_lost in lost]
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=linewidths,
+                                     linestyles=linestyles))
+    if goal_segments:
+        ax.add_collection(LineCollection(goal_segments, colors='k', linestyles='--', alpha=0.5))
+    ax.autoscale_view()
+
+    # Legend proxies for the collections
+    plt.plot([], [], color='gray', linewidth=2, label='Delivered Ice')
+    plt.plot([], [], '--', color='gray', linewidth=1, label='Lost')
+    plt.plot([], [], color='gray', linewidth=1, label='Searching')
+    if goal_segments:
+        plt.plot([], [], 'k--', alpha=0.5, label='Goal Trail')
+
+
+def plot_ants(ants):
+    """
+    Plots the path of every ant from the object-based simulation.
+    """
+    draw_paths(
+        [ant.path[:ant.step_count] for ant in ants],
+        [ant.has_delivered_ice for ant in ants],
+        [ant.lost for ant in ants],
+        [ant.goal_path for ant in ants if ant.goal_path is not None],   # Ants that found the ice
+    )
+
+
+def plot_swarm(paths, step_count, modes):
+    """
+    Plots the search path of every ant from the vectorized simulation.
+    Delivering ants walked the same path back, which is drawn as a goal trail.
+    """
+    segments = [paths[i, :step_count[i]] for i in range(len(modes))]
+    delivered = modes == MODE_IDLE
+    draw_paths(
+        segments,
+        delivered,
+        modes == MODE_LOST,
+        [segments[i] for i in np.flatnonzero(delivered)],
+    )
+
 
-for ant in ants:
-    x, y = zip(*ant.path)
-    if ant.has_delivered_ice:
-        plt.plot(x, y, label=f'Ant {ant.id} (Delivered Ice)', linewidth=2)
-    elif ant.lost:
-        plt.plot(x, y, '--', label=f'Ant {ant.id} (Lost)', linewidth=1)
+def plot_trials(results):
+    """
+    Plots statistics over a batch of runs: the fraction of ants delivering
+    ice per run and the mean distance each ant searched per run.
+    """
+    delivered = [r["delivered"] / NUM_ANTS for r in results]
+    distances = [r["mean_distance"] for r in results]
+
+    fig, (ax_delivered, ax_distance) = plt.subplots(1, 2, figsize=(12, 5))
+    ax_delivered.hist(delivered, bins=np.linspace(0, 1, 21))
+    ax_delivered.set_title('Ants Delivering Ice per Run')
+    ax_delivered.set_xlabel('Fraction of Ants')
+    ax_delivered.set_ylabel('Runs')
+    ax_distance.hist(distances, bins=20)
+    ax_distance.set_title('Mean Search Distance per Run')
+    ax_distance.set_xlabel('Distance (m)')
+    ax_distance.set_ylabel('Runs')
+    fig.suptitle(f'Ant Ice Retrieval Simulation ({len(results)} runs)')
+    fig.tight_layout()
+
+
+def draw_landmarks():
+    """
+    Marks the lander and ice deposit and labels the figure.
+    """
+    plt.scatter([0], [0], color='black', label='Lander')
+    ice_circle = plt.Circle(ICE_LOCATION, ICE_RADIUS, color='blue', alpha=0.5, label='Ice Deposit')
+    plt.gca().add_patch(ice_circle)
+
+    plt.title('Ant Ice Retrieval Simulation')
+    plt.xlabel('X Position (m)')
+    plt.ylabel('Y Position (m)')
+    plt.legend()
+    plt.grid(True)
+    plt.axis('equal')
+
+
+def positive_int(text):
+    """
+    argparse type for counts that must be at least 1.
+    """
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main():
+    """
+    Parses the command line, runs the chosen simulation variant once (or as a
+    batch of runs), and shows the resulting figure.
+    """
+    parser = argparse.ArgumentParser(description="Ant ice retrieval simulation")
+    parser.add_argument("--variant", choices=VARIANTS, default=VARIANT,
+                        help="simulation implementation (default: %(default)s)")
+    parser.add_argument("--trials", type=positive_int, default=NUM_TRIALS,
+                        help="independent runs; above 1 runs a batch and plots statistics")
+    parser.add_argument("--seed", type=int, default=SEED, help="base random seed")
+    parser.add_argument("--parallel", action="store_true",
+                        help="search each ant in a worker process (objects variant, single run)")
+    parser.add_argument("--numba", action="store_true",
+                        help="compile the swarm tick with Numba (vectorized variant; pays off for large swarms)")
+    args = parser.parse_args()
+    if args.variant == "jax" and importlib.util.find_spec("jax") is None:
+        parser.error("--variant jax requires the jax package")
+    if args.parallel and args.variant != "objects":
+        parser.error("--parallel only applies to --variant objects")
+    if args.parallel and args.trials > 1:
+        parser.error("--parallel only applies to single runs; batches already use a process pool")
+    if args.numba and args.variant != "vectorized":
+        parser.error("--numba only applies to --variant vectorized")
+    if args.numba and importlib.util.find_spec("numba") is None:
+        parser.error("--numba requires the numba package")
+
+    if args.trials > 1:
+        # Batch Mode: one independent run per seed
+        seeds = range(args.seed, args.seed + args.trials)
+        simulate = partial(run_simulation, variant=args.variant, use_numba=args.numba)
+        if args.variant == "jax":
+            # JAX already uses the whole device per run; forking would not help
+            results = list(map(simulate, seeds))
+        else:
+            with Pool() as pool:
+                results = list(pool.imap_unordered(simulate, seeds))
+        plot_trials(results)
     else:
-        plt.plot(x, y, label=f'Ant {ant.id}', linewidth=1)
-
-# Visualize goal trails (for ants that found the ice)
-for ant in ants:
-    if ant.goal_path:
-        x_goal = [dot.pos[0] for dot in ant.goal_path]
-        y_goal = [dot.pos[1] for dot in ant.goal_path]
-        plt.plot(x_goal, y_goal, 'k--', alpha=0.5)
-
-# Mark lander and ice location
-plt.scatter([0], [0], color='black', label='Lander')
-ice_circle = plt.Circle(ICE_LOCATION, ICE_RADIUS, color='blue', alpha=0.5, label='Ice Deposit')
-plt.gca().add_patch(ice_circle)
-
-plt.title('Ant Ice Retrieval Simulation')
-plt.xlabel('X Position (m)')
-plt.ylabel('Y Position (m)')
-plt.legend()
-plt.grid(True)
-plt.axis('equal')
-plt.show()
+        plt.figure(figsize=(10, 8))
+        if args.variant == "objects":
+            plot_ants(run_ants(args.seed, parallel=args.parallel))
+        elif args.variant == "jax":
+            plot_swarm(*simulate_swarm_jax(args.seed))
+        else:
+            plot_swarm(*simulate_swarm(args.seed, args.numba))
+        draw_landmarks()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
 
 """
 ===============================================================================